@@ -3,12 +3,26 @@
 from typing import Final
 
 # Summary Configuration
-MESSAGES_BEFORE_SUMMARY: Final[int] = 30
-"""Trigger summarization when message count exceeds this threshold"""
+MAX_CONTEXT_TOKENS: Final[int] = 16_000
+"""Token budget for the conversation history (summary + messages) sent to the model"""
+
+SUMMARY_TRIGGER_FRACTION: Final[float] = 0.25
+"""Trigger summarization when the history exceeds this share of MAX_CONTEXT_TOKENS"""
 
 MESSAGES_TO_KEEP: Final[int] = 20
 """Number of recent messages to keep after summarization"""
 
+MIN_MESSAGES_TO_SUMMARIZE: Final[int] = 4
+"""Minimum number of messages beyond MESSAGES_TO_KEEP before a summary pass is worthwhile"""
+
+TOKEN_ENCODING: Final[str] = "o200k_base"
+"""tiktoken encoding used to count history tokens"""
+
+
+# Correction Configuration
+MIN_CORRECTION_CHARS: Final[int] = 6
+"""Student messages shorter than this (e.g. "Sí.", "OK") are not sent for correction"""
+
 
 # Audio Configuration
 GENDER_TO_VOICE = {"male": "ash", "female": "shimmer"}
@@ -1,9 +1,10 @@
 """LangGraph workflow for chat conversations"""
 
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, List, Union
+from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph, END, START
 from app.features.chat.state import ChatState
-from app.features.prompts.chat.prompt_utils import ChatPromptHelper
+from app.features.chat.utils import get_prompt_helper
 from app.features.chat.nodes import (
     generate_initial_question,
     call_model,
@@ -14,7 +15,6 @@ from app.features.chat.nodes import (
 from langfuse.langchain import CallbackHandler as LangfuseCallbackHandler
 
 
-
 def initialize_state(state: ChatState) -> Dict[str, Any]:
     """
     Initialize node: Set up prompt_helper if not already initialized.
@@ -39,12 +39,8 @@ def initialize_state(state: ChatState) -> Dict[str, Any]:
     foreign_language = state.get("foreign_language", "Spanish (Spain)")
     native_language = state.get("native_language", "English (US)")
     
-    # Create prompt helper
-    prompt_helper = ChatPromptHelper(
-        student_level=student_level,
-        foreign_language=foreign_language,
-        native_language=native_language,
-    )
+    # Get (cached) prompt helper
+    prompt_helper = get_prompt_helper(student_level, foreign_language, native_language)
     
     # Return initialized state
     return {
@@ -53,29 +49,29 @@ def initialize_state(state: ChatState) -> Dict[str, Any]:
         "correction_buffer": {} 
     }
 
-def route_after_init(state: ChatState) -> Literal["generate_initial_question", "call_model"]:
+def route_after_init(state: ChatState) -> Union[Literal["generate_initial_question"], List[str]]:
     """
     Route after initialization based on conversation state.
     
     Returns:
         - "generate_initial_question" if new conversation (no messages)
-        - "call_model" if ongoing conversation (has messages)
+        - ["call_model", "correct_response"] if ongoing conversation (has
+          messages), so both branches run in parallel in the same step.
+          correct_response is only scheduled if the last message is from the
+          student; it records an empty correction for replies too short to check.
+    
+    Node names (not Send objects) are returned: both nodes read the shared
+    state, and a Send would store its own copy of the state in the checkpoint.
     """
-    has_messages = len(state.get("messages", [])) > 0
+    messages = state.get("messages", [])
     
-    if has_messages:
-        return "continue_conversation"
+    if messages:
+        if isinstance(messages[-1], HumanMessage):
+            return ["call_model", "correct_response"]
+        return ["call_model"]
     
     return "generate_initial_question"
 
-def fanout_after_init(state: ChatState) -> Dict[str, Any]:
-    # No state changes; existence of edges below triggers both branches
-    return {}
-
-def fanin_after_processing(state: ChatState) -> Dict[str, Any]:
-    # No state changes; existence of edges below triggers both branches
-    return {}
-
 
 def create_chat_graph():
     """
@@ -93,13 +89,13 @@ def create_chat_graph():
     
     Ongoing Conversation:
     1. START -> initialize_state (already has prompt_helper)
-    2. initialize_state -> fanout_after_init (fan-out point)
+    2. initialize_state -> parallel fan-out from route_after_init
     3. Parallel execution:
        - call_model (async - generate AI response)
        - correct_response (async - correct user's previous message)
-    4. Both converge -> fanin_after_processing
-    5. fanin_after_processing -> check if summarization needed
-       - If yes: summarize_conversation (async) -> END
+    4. call_model -> check if summarization needed (correct_response -> END)
+       - If yes: summarize_conversation (async) -> END, in the step after
+         both branches have finished
        - If no: END
     
     Usage:
@@ -109,6 +105,11 @@ def create_chat_graph():
         # Streaming (async)
         async for event in chat_graph.astream(input_state):
             print(event)
+        
+        # Token streaming: the tutor's foreign-language text as it is generated
+        # (see stream_foreign_message in utils.py)
+        async for text_so_far in stream_foreign_message(chat_graph, input_state):
+            print(text_so_far)
     
     Returns:
         Compiled StateGraph ready for async invocation
@@ -119,39 +120,32 @@ def create_chat_graph():
     # Add nodes
     workflow.add_node("initialize_state", initialize_state)
     workflow.add_node("generate_initial_question", generate_initial_question)
-    workflow.add_node("fanout_after_init", fanout_after_init)
     workflow.add_node("correct_response", correct_response)
     workflow.add_node("call_model", call_model)
-    workflow.add_node("fanin_after_processing", fanin_after_processing)
     workflow.add_node("summarize_conversation", summarize_conversation)
     
     # Set entry point to initialization
     workflow.add_edge(START, "initialize_state")
     
-    # After initialization, route to validation or model based on conversation state
+    # After initialization, either generate the opening question or fan out
+    # to respond and correct the user response in parallel
     workflow.add_conditional_edges(
         "initialize_state",
         route_after_init,
-        {
-            "generate_initial_question": "generate_initial_question",
-            "continue_conversation": "fanout_after_init"
-        }
+        ["generate_initial_question", "call_model", "correct_response"]
     )
     
     # After generating initial question, end (return to user for response)
     workflow.add_edge("generate_initial_question", END)
     
-    # After init fan out - respond and correct user response in parallel
-    workflow.add_edge("fanout_after_init", "call_model")
-    workflow.add_edge("fanout_after_init", "correct_response")
-
-    # Both branches converge on apply_correction
-    workflow.add_edge("call_model", "fanin_after_processing")
-    workflow.add_edge("correct_response", "fanin_after_processing")
+    # The correction branch only writes its correction record
+    workflow.add_edge("correct_response", END)
     
-    # After applying correction, check if we need to summarize
+    # After responding, check if we need to summarize. Only call_model adds
+    # messages, and LangGraph finishes both parallel branches before running
+    # the next step, so no separate fan-in node is needed.
     workflow.add_conditional_edges(
-        "fanin_after_processing",
+        "call_model",
         should_summarize,
         {
             True: "summarize_conversation",   # Need to summarize
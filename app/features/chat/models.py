@@ -1,13 +1,16 @@
-from pydantic import BaseModel, Field
-from typing import List
-from langchain_core.messages import BaseMessage
+from pydantic import BaseModel, ConfigDict, Field
 
+# Field order matters: structured output is generated in declared order, so
+# foreign_language_message streams first (see stream_foreign_message in utils.py).
+# Kept out of the docstring, which becomes the schema description sent to the model.
 class LLMTurn(BaseModel):
     """Represents one tutor response with both languages:
     - foreign_language_message: message in the student's target language
     - native_language_message: translation in the student's native language
     """
 
+    model_config = ConfigDict(frozen=True)
+
     foreign_language_message: str = Field(
         ...,
         description="Your response in the student's target language"
@@ -16,6 +19,11 @@ class LLMTurn(BaseModel):
         ...,
         description="The same message translated into the student's native language"
     )
+
+# Only requested when state["debug_reasoning"] is set (see call_model)
+class LLMTurnWithReasoning(LLMTurn):
+    """Tutor response plus the model's reasoning"""
+
     reasoning: str = Field(
         ...,
         description="The reasoning for the response in English"
@@ -23,10 +31,16 @@ class LLMTurn(BaseModel):
 
 class LLMSummary(BaseModel):
     """Summary of the conversation for context management"""
+    model_config = ConfigDict(frozen=True)
+
     summary: str
 
+# corrected comes first so the model commits to the yes/no decision before
+# generating any text; when it is False the correction is an empty string.
 class LLMResponseCorrection(BaseModel):
     """Correction of the response of the student"""
+    model_config = ConfigDict(frozen=True)
+
+    corrected: bool = Field(..., description="True if the response was corrected, False otherwise")
     corrected_foreign_language: str = Field(..., description="The corrected message in the foreign language, or an empty string if the response was correct")
-    native_language_message: str = Field(..., description="The corrected message in the native language")
-    corrected: bool = Field(..., description="True if the response was corrected, False otherwise")
\ No newline at end of file
+    native_language_message: str = Field(..., description="The corrected message in the native language")
\ No newline at end of file
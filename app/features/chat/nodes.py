@@ -1,33 +1,145 @@
 """Graph nodes for chat feature"""
 
-from typing import Dict, Any, List, Optional
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Dict, Any, Final, List, Optional, Tuple, Type
+import tiktoken
 from langchain_core.messages import SystemMessage, HumanMessage, RemoveMessage, BaseMessage, AIMessage
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig
 from app.services.llm import llm_response, llm_summary, llm_response_correction
 from app.features.chat.state import ChatState, CorrectionRecord
-from app.features.chat.config import MESSAGES_BEFORE_SUMMARY, MESSAGES_TO_KEEP, GENDER_TO_VOICE
+from app.features.chat.config import (
+    MAX_CONTEXT_TOKENS,
+    SUMMARY_TRIGGER_FRACTION,
+    MESSAGES_TO_KEEP,
+    MIN_MESSAGES_TO_SUMMARIZE,
+    TOKEN_ENCODING,
+    MIN_CORRECTION_CHARS,
+    GENDER_TO_VOICE
+)
 from app.features.prompts.chat.prompt_utils import ChatPromptHelper
-from app.features.chat.models import LLMTurn, LLMSummary, LLMResponseCorrection
+from app.features.chat.models import LLMTurn, LLMTurnWithReasoning, LLMSummary, LLMResponseCorrection
 from app.services.language_validation import get_language_greeting, get_language_topic
 from app.services.audio import generate_audio
 
-def generate_initial_question(state: ChatState) -> Dict[str, Any]:
+logger = logging.getLogger(__name__)
+
+_BEGINNER_LEVELS: Final[frozenset[str]] = frozenset({"A1", "A2"})
+"""CEFR levels that get the greeting only, without the topic question"""
+
+
+# Structured-output runnables are built lazily on first use and reused, rather
+# than re-creating the client and JSON schema binding on every node call.
+@lru_cache(maxsize=None)
+def _structured_response(schema: Type[LLMTurn]) -> Runnable:
+    return llm_response().with_structured_output(schema)
+
+@lru_cache(maxsize=1)
+def _structured_correction() -> Runnable:
+    return llm_response_correction().with_structured_output(LLMResponseCorrection)
+
+@lru_cache(maxsize=1)
+def _structured_summary() -> Runnable:
+    return llm_summary().with_structured_output(LLMSummary)
+
+@lru_cache(maxsize=1024)
+def _prompt_cache_key(system_prompt: str) -> str:
+    """
+    Stable OpenAI prompt_cache_key for a system prompt.
+    
+    OpenAI caches byte-identical prompt prefixes automatically; sending the
+    same key for every request that shares a system prompt routes them to
+    the same cache so the static prefix is not prefilled again on each turn.
+    """
+    return "korli-" + hashlib.blake2b(system_prompt.encode(), digest_size=8).hexdigest()
+
+@lru_cache(maxsize=1024)
+def _system_message(content: str) -> SystemMessage:
+    """
+    Shared SystemMessage for a system prompt.
+    
+    System prompts are fixed per prompt helper, so the message is built (and
+    validated) once and the identical object is reused on every turn.
+    Messages are never mutated once built, so sharing them is safe.
+    """
+    return SystemMessage(content=content)
+
+def _load_encoding() -> Optional[tiktoken.Encoding]:
+    """
+    Load the tokenizer used for the summary token budget.
+    
+    Called once at import: the first get_encoding() may download the BPE
+    file with blocking I/O, which must never happen inside an async node
+    or router. If it cannot be loaded (e.g. no network), token counts fall
+    back to a character-based estimate.
+    """
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception:
+        logger.warning("Could not load tiktoken encoding %r; estimating token counts", TOKEN_ENCODING, exc_info=True)
+        return None
+
+_ENCODING: Final[Optional[tiktoken.Encoding]] = _load_encoding()
+
+@lru_cache(maxsize=4096)
+def _count_tokens(text: str) -> int:
+    """
+    Count tokens in a text.
+    
+    Cached on the text itself, so historical messages are only encoded once
+    and each turn only pays the encode cost for the newest messages.
+    """
+    if _ENCODING is None:
+        return len(text) // 4 + 1  # ~4 characters per token
+    return len(_ENCODING.encode_ordinary(text))
+
+def _message_tokens(message: BaseMessage) -> int:
+    """Token count for a message, preferring the count stored when it was emitted."""
+    token_count = message.additional_kwargs.get("token_count")
+    if token_count is not None:
+        return token_count
+    content = message.content
+    return _count_tokens(content if isinstance(content, str) else message.text)
+
+@lru_cache(maxsize=1024)
+def _opening_lines(foreign_language: str, native_language: str, ask_topic: bool) -> Tuple[str, str]:
+    """
+    Build the (foreign, native) opening lines for a conversation.
+    
+    The greeting and topic question are static entries in the language map,
+    so the combined lines are memoized per language pair. Above A1/A2 the
+    topic question is appended to the greeting.
+    """
+    foreign_line: str = get_language_greeting(foreign_language)
+    native_line: str = get_language_greeting(native_language)
+    if ask_topic:
+        foreign_line = f"{foreign_line} {get_language_topic(foreign_language)}"
+        native_line = f"{native_line} {get_language_topic(native_language)}"
+    return foreign_line, native_line
+
+async def generate_initial_question(state: ChatState) -> Dict[str, Any]:
     """
     Generate the opening greeting for the conversation.
     
     Uses pre-defined A1-level greetings from the language map.
     The greeting is simple ("Hello! How are you?") and shown in both
     the student's target (foreign) and native languages.
+    
+    Declared async (although it does no I/O) so the graph never has to
+    dispatch it to the thread pool when invoked via ainvoke/astream.
     """
     prompt_helper: ChatPromptHelper = state["prompt_helper"]
     
     # Build messages specifically for initial question generation
-    native_language_greeting: str = get_language_greeting(prompt_helper.native_language)
-    foreign_language_greeting: str = get_language_greeting(prompt_helper.foreign_language)
-    if state.get("student_level") not in ["A1", "A2"]:
-        native_language_greeting = f"{native_language_greeting} {get_language_topic(prompt_helper.native_language)}"
-        foreign_language_greeting = f"{foreign_language_greeting} {get_language_topic(prompt_helper.foreign_language)}"
+    foreign_language_greeting, native_language_greeting = _opening_lines(
+        prompt_helper.foreign_language,
+        prompt_helper.native_language,
+        state.get("student_level") not in _BEGINNER_LEVELS
+    )
 
+    # No token_count here: the greeting path stays free of tokenizer work,
+    # and _message_tokens counts it lazily if it is still around at summary time
     ai_message = AIMessage(
         content=foreign_language_greeting,
         additional_kwargs={"translation": native_language_greeting}
@@ -44,25 +156,35 @@ async def call_model(state: ChatState, config: RunnableConfig) -> Dict[str, Any]
     prompt_helper: ChatPromptHelper = state["prompt_helper"]
     summary: str = state.get("summary", "")
 
-    # Build messages with proper system prompt
+    # Build messages with proper system prompt. Order is static system prompt
+    # -> (optional) summary -> conversation so the cached prefix stays stable.
     if summary:
         # Create summary message using the prompt helper
         summary_message: str = prompt_helper.create_summary_message(summary, len(state["messages"]))
         messages: List[BaseMessage] = [
-            SystemMessage(content=prompt_helper.system_prompt),
-            HumanMessage(content=summary_message)
-        ] + state["messages"]
+            _system_message(prompt_helper.system_prompt),
+            HumanMessage(content=summary_message),
+            *state["messages"]
+        ]
     else:
         # Regular conversation flow (no summary yet)
         messages: List[BaseMessage] = [
-            SystemMessage(content=prompt_helper.system_prompt)
-        ] + state["messages"]
+            _system_message(prompt_helper.system_prompt),
+            *state["messages"]
+        ]
     
-    for message in messages:
-        print(message)
-    # Get structured response with both foreign and native language messages
-    structured_llm = llm_response().with_structured_output(LLMTurn)
-    response: LLMTurn = await structured_llm.ainvoke(messages)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("call_model input: %s", messages)
+    # Get structured response with both foreign and native language messages.
+    # Reasoning costs output tokens on the critical path, so only ask for it when debugging.
+    debug_reasoning: bool = bool(state.get("debug_reasoning"))
+    structured_llm = _structured_response(LLMTurnWithReasoning if debug_reasoning else LLMTurn)
+    response: LLMTurn = await structured_llm.ainvoke(
+        messages,
+        prompt_cache_key=_prompt_cache_key(prompt_helper.system_prompt)
+    )
+    if debug_reasoning:
+        logger.debug("call_model reasoning: %s", response.reasoning)
 
     # Get thread_id from config for organizing audio files
     thread_id = config.get("configurable", {}).get("thread_id")
@@ -76,25 +198,34 @@ async def call_model(state: ChatState, config: RunnableConfig) -> Dict[str, Any]
         storage="supabase"
     )
     
-    # Store foreign language message with translation and audio URL in metadata
+    # Store foreign language message with translation, audio URL and token count in metadata
     ai_message = AIMessage(
         content=response.foreign_language_message,
         additional_kwargs={
             "translation": response.native_language_message,
-            "audio_url": audio_result["url"]
+            "audio_url": audio_result["url"],
+            "token_count": _count_tokens(response.foreign_language_message)
         }
     )
     
     return {"messages": [ai_message]}
 
+_SUMMARY_TOKEN_THRESHOLD: int = int(SUMMARY_TRIGGER_FRACTION * MAX_CONTEXT_TOKENS)
+
 def should_summarize(state: ChatState) -> bool:
     """
     Check if conversation history needs summarization.
     
     Returns:
-        True if message count exceeds threshold, False otherwise
+        True if the summary plus messages exceed the token threshold and there
+        are enough messages beyond MESSAGES_TO_KEEP to fold in, False otherwise
     """
-    return len(state["messages"]) > MESSAGES_BEFORE_SUMMARY
+    messages: List[BaseMessage] = state["messages"]
+    if len(messages) - MESSAGES_TO_KEEP < MIN_MESSAGES_TO_SUMMARIZE:
+        return False
+    
+    total_tokens = _count_tokens(state.get("summary", "")) + sum(_message_tokens(m) for m in messages)
+    return total_tokens > _SUMMARY_TOKEN_THRESHOLD
 
 async def summarize_conversation(state: ChatState) -> Dict[str, Any]:
     """
@@ -102,8 +233,12 @@ async def summarize_conversation(state: ChatState) -> Dict[str, Any]:
     
     When the history exceeds threshold (configured in config.py):
     1. Keep the most recent messages (MESSAGES_TO_KEEP)
-    2. Summarize the older messages in the foreign language
+    2. Fold the older messages into the existing summary, in the foreign language
     3. Store summary separately, remove old messages
+    
+    The update is incremental: messages folded into the summary are removed
+    from state, so each pass only sends the existing summary plus the
+    messages added since the previous pass.
     """
     prompt_helper: ChatPromptHelper = state["prompt_helper"]
     
@@ -129,7 +264,7 @@ async def summarize_conversation(state: ChatState) -> Dict[str, Any]:
     ]
     
     # Get structured summary response
-    structured_llm = llm_summary().with_structured_output(LLMSummary)
+    structured_llm = _structured_summary()
     response: LLMSummary = await structured_llm.ainvoke(summary_messages)
     
     # Delete the old messages that were summarized
@@ -140,28 +275,58 @@ async def summarize_conversation(state: ChatState) -> Dict[str, Any]:
         "messages": delete_messages
     }
 
+def needs_correction(message: BaseMessage) -> bool:
+    """
+    Check if a message is worth sending to the correction model.
+    
+    Returns:
+        False for AI messages and for student replies too short to correct
+        (shorter than MIN_CORRECTION_CHARS), True otherwise
+    """
+    if not isinstance(message, HumanMessage):
+        return False
+    content = message.content
+    text = content if isinstance(content, str) else message.text
+    return len(text.strip()) >= MIN_CORRECTION_CHARS
+
 async def correct_response(state: ChatState, config: RunnableConfig) -> Dict[str, Any]:
     """
     Correct the user's previous message for grammar and language errors.
     
     Analyzes the last user message and provides corrections if needed.
     Stores correction information in the corrections dict keyed by message ID.
+    Messages that fail needs_correction skip the LLM call: AI messages get no
+    entry, and student replies too short to correct get an empty (uncorrected)
+    record so every student message id has one.
     """
     prompt_helper: ChatPromptHelper = state["prompt_helper"]
     message: BaseMessage = state["messages"][-1]
+    if not needs_correction(message):
+        if not isinstance(message, HumanMessage):
+            return {}
+        empty_record: CorrectionRecord = {
+            "corrected_message": "",
+            "translation": "",
+            "corrected": False,
+            "audio_url": None
+        }
+        return {"corrections": {message.id: empty_record}}
 
     # Create human correction prompt
     human_correction_prompt: str = prompt_helper.create_human_correction_prompt(message)
 
     # Build messages for response correction
     messages: List[BaseMessage] = [
-        SystemMessage(content=prompt_helper.system_correction_prompt),
+        _system_message(prompt_helper.system_correction_prompt),
         HumanMessage(content=human_correction_prompt)
     ]
 
     # Get structured response correction
-    structured_llm = llm_response_correction().with_structured_output(LLMResponseCorrection)
-    response: LLMResponseCorrection = await structured_llm.ainvoke(messages)
+    structured_llm = _structured_correction()
+    response: LLMResponseCorrection = await structured_llm.ainvoke(
+        messages,
+        prompt_cache_key=_prompt_cache_key(prompt_helper.system_correction_prompt)
+    )
 
     # Get thread_id from config for organizing audio files
     thread_id = config.get("configurable", {}).get("thread_id")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Literal
 from app.services.language_validation import validate_language
 
@@ -40,7 +40,7 @@ class ChatInitializationInput(BaseModel):
         """Validate that language is supported"""
         return validate_language(v)
     
-    @field_validator('lesson_topic')
+    @field_validator('topic')
     @classmethod
     def validate_topic(cls, v: str) -> str:
         """Validate and clean the lesson topic"""
@@ -49,13 +49,14 @@ class ChatInitializationInput(BaseModel):
             raise ValueError("Lesson topic cannot be empty")
         return topic
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "student_level": "B2",
                 "foreign_language": "Spanish (Spain)",
                 "native_language": "English (US)",
-                "lesson_topic": "food and dining"
+                "topic": "food and dining"
             }
         }
+    )
 
@@ -23,6 +23,7 @@ class ChatState(MessagesState):
     student_level: Student's CEFR level (for initialization)
     foreign_language: Language being learned (for initialization)
     native_language: Student's native language (for initialization)
+    debug_reasoning: Ask the tutor model for its reasoning (debugging only)
     """
     # Initialization parameters (used to create prompt_helper)
     student_level: Optional[str]
@@ -30,6 +31,7 @@ class ChatState(MessagesState):
     native_language: Optional[str]
     tutor_gender: Optional[Literal["male", "female"]]
     student_gender: Optional[Literal["male", "female"]]
+    debug_reasoning: Optional[bool]
     
     # Core state
     summary: str
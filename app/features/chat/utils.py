@@ -1,7 +1,30 @@
 """Utility functions for chat feature"""
 
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+from langchain_core.messages import AIMessageChunk
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.utils.json import parse_partial_json
 from app.features.chat.state import ChatState
 from app.features.chat.schemas import ChatInitializationInput
+from app.features.prompts.chat.prompt_utils import ChatPromptHelper
+
+
+@lru_cache(maxsize=512)
+def get_prompt_helper(student_level: str, foreign_language: str, native_language: str) -> ChatPromptHelper:
+    """
+    Return a shared ChatPromptHelper for the given parameters.
+    
+    The helper's prompts are pure functions of these three values, so
+    conversations with the same settings reuse one instance (and send
+    byte-identical system prompts, which maximizes prompt-cache hits).
+    Nodes only read from the helper; it must never be mutated.
+    """
+    return ChatPromptHelper(
+        student_level=student_level,
+        foreign_language=foreign_language,
+        native_language=native_language,
+    )
 
 
 def create_initial_state(input_data: ChatInitializationInput) -> ChatState:
@@ -9,8 +32,8 @@ def create_initial_state(input_data: ChatInitializationInput) -> ChatState:
     Create initial state for a new conversation.
     
     This is a convenience function for API/programmatic use. It prepares
-    the state with initialization parameters that will be processed by
-    the graph's initialize_state node.
+    the state with initialization parameters and the shared prompt helper,
+    so the graph's initialize_state node has nothing left to build.
     
     Args:
         input_data: Validated chat initialization parameters
@@ -38,6 +61,50 @@ def create_initial_state(input_data: ChatInitializationInput) -> ChatState:
         student_level=input_data.student_level,
         foreign_language=input_data.foreign_language,
         native_language=input_data.native_language,
-        prompt_helper=None  
+        prompt_helper=get_prompt_helper(
+            input_data.student_level,
+            input_data.foreign_language,
+            input_data.native_language
+        )
     )
 
+
+async def stream_foreign_message(
+    graph: Runnable,
+    input_state: Any,
+    config: Optional[RunnableConfig] = None
+) -> AsyncIterator[str]:
+    """
+    Stream the tutor's foreign-language reply while it is being generated.
+    
+    call_model's structured output arrives as JSON fragments under
+    stream_mode="messages". They are accumulated and parsed as partial JSON,
+    and foreign_language_message is yielded each time it grows (the full text
+    so far, not a delta). It is the first field of LLMTurn, so it completes
+    before native_language_message starts.
+    
+    Args:
+        graph: Compiled chat graph (e.g. chat_graph)
+        input_state: Graph input for this turn
+        config: Optional run config (e.g. thread_id)
+        
+    Yields:
+        The foreign-language message generated so far
+    """
+    raw = ""
+    last = ""
+    async for chunk, metadata in graph.astream(input_state, config, stream_mode="messages"):
+        # Only the model's token chunks; the final AIMessage written to state is plain text
+        if metadata.get("langgraph_node") != "call_model" or not isinstance(chunk, AIMessageChunk):
+            continue
+        if not isinstance(chunk.content, str) or not chunk.content:
+            continue
+        raw += chunk.content
+        try:
+            partial = parse_partial_json(raw)
+        except ValueError:
+            continue
+        text = partial.get("foreign_language_message") if isinstance(partial, dict) else None
+        if text and text != last:
+            last = text
+            yield text
@@ -2,10 +2,22 @@ from .language_validation import (
     LanguageValidator,
     validate_language,
     is_language_supported,
-    get_supported_languages
+    get_supported_languages,
+    CODES,
+    GREETINGS,
+    TOPICS
 )
 from .llm import get_llm, llm_response, llm_summary, llm_response_correction
-from .http_utils import create_ssl_context, create_tcp_connector
+from .http_utils import (
+    create_ssl_context,
+    create_tcp_connector,
+    get_shared_session,
+    close_shared_session,
+    RetryableHTTPError,
+    FatalHTTPError,
+    CircuitBreaker,
+    CircuitOpenError
+)
 
 __all__ = [
     # Language validation
@@ -13,6 +25,9 @@ __all__ = [
     'validate_language',
     'is_language_supported',
     'get_supported_languages',
+    'CODES',
+    'GREETINGS',
+    'TOPICS',
     # LLM services
     'get_llm',
     'llm_response',
@@ -21,4 +36,10 @@ __all__ = [
     # HTTP utilities
     'create_ssl_context',
     'create_tcp_connector',
+    'get_shared_session',
+    'close_shared_session',
+    'RetryableHTTPError',
+    'FatalHTTPError',
+    'CircuitBreaker',
+    'CircuitOpenError',
 ]
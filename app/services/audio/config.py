@@ -1,3 +1,12 @@
 TTS_MODEL = "gpt-4o-mini-tts"
 
-STT_MODEL = "whisper-1"
\ No newline at end of file
+STT_MODEL = "whisper-1"
+
+# Number of TTS clips kept in the process-local audio cache
+TTS_CACHE_SIZE = 256
+
+# Total MP3 bytes the TTS cache may hold per process (clips larger than this are not cached)
+TTS_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Number of uploaded Supabase objects remembered per process (filename -> URL)
+UPLOAD_CACHE_SIZE = 2048
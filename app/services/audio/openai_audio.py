@@ -5,7 +5,9 @@ Async OpenAI TTS & Whisper v3 Service
 - TTS: Generates speech from text using OpenAI's TTS API.
 - STT: Transcribes short voice clips (≤25 s) to text.
 - Optionally caches the raw audio + transcript to Supabase.
-- Concurrency-safe: one global aiohttp.ClientSession + semaphore.
+- Concurrency-safe: the shared aiohttp.ClientSession + one semaphore per endpoint,
+  so a backlog of STT uploads never delays short TTS calls.
+- Identical TTS requests are served from a small in-process LRU cache.
 
 Typical use:
 -------------
@@ -20,51 +22,80 @@ Close the session with `await close_session()` at shutdown.
 
 from __future__ import annotations
 
-import os, asyncio
+import os, asyncio, hashlib, secrets
+from collections import OrderedDict
 from typing import Optional, Union
 
 import aiohttp
-from asyncio import timeout as aio_timeout
+import orjson
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from ..http_utils import create_tcp_connector
-from config import TTS_MODEL, STT_MODEL
+from ..http_utils import get_shared_session, close_shared_session, http_error, wait_retry_after, RetryableHTTPError
+from .config import TTS_MODEL, STT_MODEL, TTS_CACHE_SIZE, TTS_CACHE_MAX_BYTES
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 REQUEST_TIMEOUT = 30
 MAX_RETRIES     = 5
-CONCURRENCY_LIMIT = 20
+TTS_CONCURRENCY_LIMIT = 16
+STT_CONCURRENCY_LIMIT = 8
+
+TTS_URL = "https://api.openai.com/v1/audio/speech"
+STT_URL = "https://api.openai.com/v1/audio/transcriptions"
+
+# Process-constant request headers (payloads are pre-serialized with orjson)
+_TTS_HEADERS = {
+    "Authorization": f"Bearer {OPENAI_API_KEY}",
+    "Content-Type": "application/json"
+}
+# Multipart boundary picked once per process; random so it cannot collide with
+# the audio payload, and the Whisper headers can be built up front
+_STT_BOUNDARY = f"korli-stt-{secrets.token_hex(16)}"
+_STT_HEADERS = {
+    "Authorization": f"Bearer {OPENAI_API_KEY}",
+    "Content-Type": f"multipart/form-data; boundary={_STT_BOUNDARY}"
+}
+_STT_DELIMITER = f"--{_STT_BOUNDARY}\r\n".encode()
+_STT_CLOSE = f"--{_STT_BOUNDARY}--\r\n".encode()
+_STT_FILE_HEADER = (
+    b'Content-Disposition: form-data; name="file"; filename="speech.mp3"\r\n'
+    b"Content-Type: audio/mpeg\r\n\r\n"
+)
+
+TTS_SEM = asyncio.Semaphore(TTS_CONCURRENCY_LIMIT)
+STT_SEM = asyncio.Semaphore(STT_CONCURRENCY_LIMIT)
 
-_session: Optional[aiohttp.ClientSession] = None
-STT_SEM = asyncio.Semaphore(CONCURRENCY_LIMIT)
+# cache key -> MP3 bytes, least recently used first
+_tts_cache: OrderedDict[str, bytes] = OrderedDict()
+_tts_cache_bytes = 0  # total size of the cached clips
 
 
 def _get_session() -> aiohttp.ClientSession:
-    global _session
-    if _session is None or _session.closed:
-        connector = create_tcp_connector()
-        _session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-        )
-    return _session
+    return get_shared_session(REQUEST_TIMEOUT)
 
 
 async def close_session() -> None:
-    global _session
-    if _session and not _session.closed:
-        await _session.close()
-    _session = None
+    await close_shared_session()
 
 
 # ───────────────────────────────────────
 # TTS (Text-to-Speech)
 # ───────────────────────────────────────
 
+def tts_cache_key(text: str,
+                  *,
+                  voice: str,
+                  model: str,
+                  speed: float,
+                  instructions: Optional[str]) -> str:
+    """Content-addressed key for a TTS request: identical inputs give identical audio."""
+    raw = f"{model}|{voice}|{speed}|{instructions or ''}|{text}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
 @retry(
     stop=stop_after_attempt(MAX_RETRIES),
-    wait=wait_exponential(multiplier=1, min=1, max=6),
-    retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError))
+    wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=6)),
+    retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError, RetryableHTTPError))
 )
 async def _tts_generate(text: str,
                         voice: str = "alloy",
@@ -72,12 +103,6 @@ async def _tts_generate(text: str,
                         speed: float = 1.0,
                         instructions: Optional[str] = None) -> bytes:
     """Calls OpenAI TTS API and returns audio bytes."""
-    url = "https://api.openai.com/v1/audio/speech"
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
     payload = {
         "model": model,  # tts-1, tts-1-hd, or gpt-4o-mini-tts
         "input": text,
@@ -89,11 +114,11 @@ async def _tts_generate(text: str,
     if instructions is not None:
         payload["instructions"] = instructions
     
-    async with aio_timeout(REQUEST_TIMEOUT):
-        async with _get_session().post(url, headers=headers, json=payload) as r:
-            if r.status != 200:
-                raise RuntimeError(f"OpenAI TTS {r.status}: {await r.text()}")
-            return await r.read()
+    # Bounded by the session's ClientTimeout(total=REQUEST_TIMEOUT)
+    async with _get_session().post(TTS_URL, headers=_TTS_HEADERS, data=orjson.dumps(payload)) as r:
+        if r.status != 200:
+            raise http_error(f"OpenAI TTS {r.status}: {await r.text()}", r.status, r.headers.get("Retry-After"))
+        return await r.read()
 
 
 async def generate_speech(
@@ -125,43 +150,78 @@ async def generate_speech(
     Returns
     -------
     bytes
-        MP3 audio data
+        MP3 audio data (served from the in-process cache for repeated requests)
     """
-    async with STT_SEM:
-        return await _tts_generate(text, voice=voice, model=model, speed=speed, instructions=instructions)
+    key = tts_cache_key(text, voice=voice, model=model, speed=speed, instructions=instructions)
+    cached = _tts_cache.get(key)
+    if cached is not None:
+        _tts_cache.move_to_end(key)
+        return cached
+
+    async with TTS_SEM:
+        audio = await _tts_generate(text, voice=voice, model=model, speed=speed, instructions=instructions)
+
+    _cache_tts(key, audio)
+    return audio
+
+
+def _cache_tts(key: str, audio: bytes) -> None:
+    """Insert a clip, evicting least recently used ones past the entry or byte budget."""
+    global _tts_cache_bytes
+    if len(audio) > TTS_CACHE_MAX_BYTES:
+        return
+    previous = _tts_cache.pop(key, None)  # concurrent misses for the same key
+    if previous is not None:
+        _tts_cache_bytes -= len(previous)
+    _tts_cache[key] = audio
+    _tts_cache_bytes += len(audio)
+    while len(_tts_cache) > TTS_CACHE_SIZE or _tts_cache_bytes > TTS_CACHE_MAX_BYTES:
+        _, evicted = _tts_cache.popitem(last=False)
+        _tts_cache_bytes -= len(evicted)
 
 
 # ───────────────────────────────────────
 # STT (Speech-to-Text)
 # ───────────────────────────────────────
 
+def _build_whisper_body(bytes_data: bytes,
+                        lang_code: str | None,
+                        prompt: str | None,
+                        model: str) -> bytes:
+    """Serialize the Whisper multipart form directly (content type is in _STT_HEADERS)."""
+    fields = [("model", model)]
+    if lang_code: fields.append(("language", lang_code))
+    if prompt:    fields.append(("prompt", prompt))
+
+    parts = []
+    for name, value in fields:
+        parts += (
+            _STT_DELIMITER,
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode(),
+            value.encode(),
+            b"\r\n",
+        )
+    parts += (_STT_DELIMITER, _STT_FILE_HEADER, bytes_data, b"\r\n", _STT_CLOSE)
+    return b"".join(parts)
+
+
 @retry(
     stop=stop_after_attempt(MAX_RETRIES),
-    wait=wait_exponential(multiplier=1, min=1, max=6),
-    retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError))
+    wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=6)),
+    retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError, RetryableHTTPError))
 )
 async def _whisper(bytes_data: bytes,
                    lang_code: str | None = None,
                    prompt: str | None = None,
                    model: str = STT_MODEL) -> str:
     """Calls Whisper-v3 API and returns plain text."""
-    url = "https://api.openai.com/v1/audio/transcriptions"
-    headers = {"Authorization": f"Bearer {OPENAI_API_KEY}"}
-
-    form = aiohttp.FormData()
-    form.add_field("model", model)
-    form.add_field("file", bytes_data,
-                   filename="speech.mp3",
-                   content_type="audio/mpeg")
-    if lang_code: form.add_field("language", lang_code)
-    if prompt:    form.add_field("prompt", prompt)
-
-    async with aio_timeout(REQUEST_TIMEOUT):
-        async with _get_session().post(url, headers=headers, data=form) as r:
-            if r.status != 200:
-                raise RuntimeError(f"Whisper {r.status}: {await r.text()}")
-            data = await r.json()
-            return data["text"]
+    body = _build_whisper_body(bytes_data, lang_code, prompt, model)
+
+    async with _get_session().post(STT_URL, headers=_STT_HEADERS, data=body) as r:
+        if r.status != 200:
+            raise http_error(f"Whisper {r.status}: {await r.text()}", r.status, r.headers.get("Retry-After"))
+        data = orjson.loads(await r.read())
+        return data["text"]
 
 
 async def transcribe_audio(
@@ -1,13 +1,17 @@
 # app/services/audio/pipeline.py
 from __future__ import annotations
-from typing import Optional, Literal, Dict
-from datetime import datetime, timezone
-import uuid
-from .openai_audio import generate_speech
+import base64
+from collections import OrderedDict
+from typing import Optional, Literal, Dict, Tuple
+from .config import UPLOAD_CACHE_SIZE
+from .openai_audio import generate_speech, tts_cache_key
 from .supabase_upload import upload_audio_to_supabase
 
 Storage = Literal["supabase", "memory", "none"]
 
+# Supabase filename -> (public URL, bytes_len) for audio this process already uploaded
+_uploaded: OrderedDict[str, Tuple[str, int]] = OrderedDict()
+
 async def generate_audio(
     *,
     text: str,
@@ -35,6 +39,10 @@ async def generate_audio(
       thread_id: Optional thread ID for organizing files
       upsert: Whether to upsert when uploading to Supabase
     
+    Supabase filenames are content-addressed (hash of text, voice, model, speed
+    and instructions), so audio this process has already uploaded is returned
+    straight from its URL without another TTS call or upload.
+    
     Returns:
       {
         "url": str | None,      # e.g. Supabase public URL
@@ -42,6 +50,17 @@ async def generate_audio(
         "bytes_len": int,       # diagnostic
       }
     """
+    if storage == "supabase":
+        # Organize by thread_id if provided (creates folder structure in Supabase)
+        key = tts_cache_key(text, voice=voice, model=model, speed=speed, instructions=instructions)
+        filename = f"{thread_id or 'shared'}/{filename_prefix}_{key}.mp3"
+
+        uploaded = _uploaded.get(filename)
+        if uploaded is not None:
+            _uploaded.move_to_end(filename)
+            url, bytes_len = uploaded
+            return {"url": url, "b64": None, "bytes_len": bytes_len}
+
     audio_bytes = await generate_speech(
         text=text, 
         voice=voice, 
@@ -51,22 +70,15 @@ async def generate_audio(
     )
 
     if storage == "supabase":
-        # Create unique filename: timestamp + UUID for guaranteed uniqueness
-        ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        unique_id = uuid.uuid4().hex[:8]
-        
-        # Organize by thread_id if provided (creates folder structure in Supabase)
-        if thread_id:
-            filename = f"{thread_id}/{filename_prefix}_{ts}_{unique_id}.mp3"
-        else:
-            filename = f"{filename_prefix}_{ts}_{unique_id}.mp3"
-            
         url = await upload_audio_to_supabase(audio_bytes, filename, upsert=upsert)
+
+        _uploaded[filename] = (url, len(audio_bytes))
+        if len(_uploaded) > UPLOAD_CACHE_SIZE:
+            _uploaded.popitem(last=False)
         return {"url": url, "b64": None, "bytes_len": len(audio_bytes)}
 
     if storage == "memory":
         # If you prefer pushing bytes/base64 to the client directly:
-        import base64
         return {"url": None, "b64": base64.b64encode(audio_bytes).decode("ascii"), "bytes_len": len(audio_bytes)}
 
     # storage == "none": caller decides what to do with raw bytes (e.g., WebSocket stream)
@@ -9,87 +9,130 @@ from __future__ import annotations
 
 import os
 import asyncio
-from typing import Optional
+import logging
+from typing import AsyncIterator, Final
 
 import aiohttp
-from asyncio import timeout as aio_timeout
 from tenacity import (
-    retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+    RetryError, retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
 )
 
-from ..http_utils import create_tcp_connector
+from ..http_utils import (
+    get_shared_session, close_shared_session, http_error, wait_retry_after,
+    RetryableHTTPError, CircuitBreaker
+)
 
 # ───────────────────────────────────────
 # Config & Constants
 # ───────────────────────────────────────
 
-SUPABASE_URL = os.getenv("SUPABASE_URL", "")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
-BUCKET_NAME = "audio-bucket"
+logger = logging.getLogger(__name__)
+
+SUPABASE_URL: Final[str] = os.getenv("SUPABASE_URL", "")
+SUPABASE_KEY: Final[str] = os.getenv("SUPABASE_KEY", "")
+BUCKET_NAME: Final[str] = "audio-bucket"
+
+# Env is read once, so check it once: warn at startup, fail fast on upload
+_CONFIGURED: Final[bool] = bool(SUPABASE_URL and SUPABASE_KEY)
+if not _CONFIGURED:
+    logger.warning("SUPABASE_URL or SUPABASE_KEY not set; Supabase uploads will fail")
 
 REQUEST_TIMEOUT = 30
 MAX_RETRIES = 5
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+# Per-request override of the session timeout: fail fast on an unreachable host
+_UPLOAD_TIMEOUT = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=5)
+
+# Process-constant request pieces (only Content-Length / x-upsert vary per call)
+_BASE_HEADERS = {
+    # New keys: use the Secret key on the server
+    "Authorization": f"Bearer {SUPABASE_KEY}",
+    "apikey": SUPABASE_KEY,  # recommended for REST calls
+    "Content-Type": "audio/mpeg",
+    "Cache-Control": "public, max-age=31536000",
+}
+_UPSERT_HEADERS = {**_BASE_HEADERS, "x-upsert": "true"}
+_URL_PREFIX = f"{SUPABASE_URL}/storage/v1/object/{BUCKET_NAME}/"
+_PUBLIC_PREFIX = f"{SUPABASE_URL}/storage/v1/object/public/{BUCKET_NAME}/"
+
+# Transient errors worth retrying; enough uploads that exhaust their retries on
+# them trips the breaker (the threshold counts uploads, not attempts)
+_TRANSIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, RetryableHTTPError)
+_circuit = CircuitBreaker("Supabase Storage")
 
 # ───────────────────────────────────────
-# Global aiohttp session
+# Shared aiohttp session
 # ───────────────────────────────────────
 
-_session: Optional[aiohttp.ClientSession] = None
-
 def _get_session() -> aiohttp.ClientSession:
-    """Lazily constructs or returns the global aiohttp session."""
-    global _session
-    if _session is None or _session.closed:
-        connector = create_tcp_connector()
-        _session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-        )
-    return _session
+    """Returns the process-wide aiohttp session (see http_utils)."""
+    return get_shared_session(REQUEST_TIMEOUT)
 
 async def close_session() -> None:
-    """Gracefully close the aiohttp session at shutdown."""
-    global _session
-    if _session and not _session.closed:
-        await _session.close()
-    _session = None
+    """Gracefully close the shared aiohttp session at shutdown."""
+    await close_shared_session()
 
 # ───────────────────────────────────────
 # Supabase upload helper
 # ───────────────────────────────────────
 
+async def _iter_chunks(data: bytes, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[memoryview]:
+    """Yields zero-copy slices of `data` so the body is streamed, not buffered."""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
 @retry(
     stop=stop_after_attempt(MAX_RETRIES),
-    wait=wait_exponential(multiplier=1, min=1, max=6),
-    retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError)),
+    # Jittered so concurrent uploaders don't retry in lockstep after a Storage hiccup
+    wait=wait_retry_after(wait_random_exponential(multiplier=1, max=30)),
+    retry=retry_if_exception_type(_TRANSIENT_ERRORS),
 )
-async def upload_audio_to_supabase(audio_bytes: bytes, filename: str, *, upsert: bool = False) -> str:
-    """
-    Uploads audio file to Supabase and returns a URL.
-    """
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        raise RuntimeError("Missing SUPABASE_URL or SUPABASE_KEY")
-
-    url = f"{SUPABASE_URL}/storage/v1/object/{BUCKET_NAME}/{filename}"
+async def _upload_with_retries(audio_bytes: bytes, filename: str, upsert: bool) -> str:
+    """Single upload attempt, retried by tenacity on transient errors."""
+    url = _URL_PREFIX + filename
     headers = {
-        # New keys: use the Secret key on the server
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "apikey": SUPABASE_KEY,  # recommended for REST calls
-        "Content-Type": "audio/mpeg",
-        "Cache-Control": "public, max-age=31536000",
+        **(_UPSERT_HEADERS if upsert else _BASE_HEADERS),
+        # Known length, so the streamed body is sent as-is rather than chunked
+        "Content-Length": str(len(audio_bytes)),
     }
-    if upsert:
-        headers["x-upsert"] = "true"
 
+    _circuit.check()  # also stops the remaining retries once the circuit opens
     session = _get_session()
-    async with aio_timeout(REQUEST_TIMEOUT):
-        async with session.put(url, data=audio_bytes, headers=headers) as resp:
-            if not (200 <= resp.status < 300):
-                error_text = await resp.text()
-                raise RuntimeError(f"Supabase upload failed ({resp.status}): {error_text}")
+    async with session.put(
+        url, data=_iter_chunks(audio_bytes), headers=headers, timeout=_UPLOAD_TIMEOUT
+    ) as resp:
+        if not (200 <= resp.status < 300):
+            error_text = await resp.text()
+            # Storage reports an existing object as 409, or as 400 with a "Duplicate" error body
+            if resp.status == 409 or (resp.status == 400 and '"Duplicate"' in error_text):
+                return _PUBLIC_PREFIX + filename
+            raise http_error(
+                f"Supabase upload failed ({resp.status}): {error_text}",
+                resp.status,
+                resp.headers.get("Retry-After")
+            )
+
+    return _PUBLIC_PREFIX + filename
 
+async def upload_audio_to_supabase(audio_bytes: bytes, filename: str, *, upsert: bool = False) -> str:
+    """
+    Uploads audio file to Supabase and returns a URL.
+    
+    Without upsert, an object that already exists under `filename` is kept
+    and its URL returned (filenames are content-addressed by the pipeline).
+    
+    While Storage is failing for many uploads at once, raises
+    CircuitOpenError immediately (not retried) instead of backing off.
+    """
+    if not _CONFIGURED:
+        raise RuntimeError("Missing SUPABASE_URL or SUPABASE_KEY")
 
-    return f"{SUPABASE_URL}/storage/v1/object/public/{BUCKET_NAME}/{filename}"
+    try:
+        return await _upload_with_retries(audio_bytes, filename, upsert)
+    except RetryError:
+        _circuit.record_failure()  # one failure per upload, once its retries are spent
+        raise
 
 
 # ───────────────────────────────────────
@@ -164,5 +207,9 @@ if __name__ == "__main__":
             await close_tts_session()
             print("✅ Sessions closed")
     
-    # Run the test
-    asyncio.run(test_tts_and_upload()) 
\ No newline at end of file
+    # Run the test (on uvloop where available, as under the server)
+    if sys.platform != "win32":
+        import uvloop
+        uvloop.run(test_tts_and_upload())
+    else:
+        asyncio.run(test_tts_and_upload()) 
\ No newline at end of file
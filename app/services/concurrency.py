@@ -1,9 +1,8 @@
 # app/services/concurrency.py
 from __future__ import annotations
 import asyncio
-from contextlib import AsyncExitStack
-from collections import defaultdict
-from typing import Dict
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Optional
 
 # ---- knobs (tune for your traffic) ----
 GLOBAL_LIMIT        = 100   # everything combined
@@ -11,48 +10,167 @@ OPENAI_LIMIT        = 20    # LLM + TTS/STT
 SUPABASE_LIMIT      = 10    # uploads / list / remove
 OTHER_IO_LIMIT      = 30    # e.g., misc HTTP APIs, disk, etc.
 PER_USER_AUDIO_LIMIT = 2    # fairness for audio pipelines
+PER_USER_MAX_ENTRIES = 10_000  # per-user pools kept before idle ones are evicted
 
-# ---- global pools (process-scoped) ----
-GLOBAL_SEM   = asyncio.Semaphore(GLOBAL_LIMIT)
-OPENAI_SEM   = asyncio.Semaphore(OPENAI_LIMIT)
-SUPABASE_SEM = asyncio.Semaphore(SUPABASE_LIMIT)
-OTHER_IO_SEM = asyncio.Semaphore(OTHER_IO_LIMIT)
+class AdmissionPool:
+    """
+    Semaphore-like counter whose limit can be changed at runtime.
+    
+    asyncio.Semaphore has no supported way to resize; here waiters queue as
+    futures in FIFO order, and both release() and set_limit() are plain
+    synchronous calls that hand freed slots straight to the next waiters.
+    Nothing in the release path awaits, so a cancelled task can never free
+    a slot without waking whoever is queued for it. Lowering the limit
+    never revokes slots already held; new acquirers wait until active
+    drops below it.
+    
+    `on_busy` (optional) is called with True when the first slot is taken
+    and with False when the last one is given back.
+    """
+    def __init__(self, limit: int, on_busy: Optional[Callable[[bool], None]] = None):
+        self._active = 0
+        self._limit = limit
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._on_busy = on_busy
 
-# Optional per-user map (process-scoped)
-_per_user_audio: Dict[str, asyncio.Semaphore] = defaultdict(
-    lambda: asyncio.Semaphore(PER_USER_AUDIO_LIMIT)
-)
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def acquire(self) -> None:
+        if not self._waiters and self._active < self._limit:
+            self._take()
+            return
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut  # _wake() counts the slot as ours before resolving fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # slot was handed over just as we were cancelled
+            else:
+                self._wake()  # drop our cancelled future, let the next waiter in
+            raise
+
+    def release(self) -> None:
+        self._active -= 1
+        if self._active == 0 and self._on_busy is not None:
+            self._on_busy(False)
+        self._wake()
+
+    def set_limit(self, limit: int) -> None:
+        self._limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._active < self._limit:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self._take()
+                fut.set_result(None)
+
+    def _take(self) -> None:
+        self._active += 1
+        if self._active == 1 and self._on_busy is not None:
+            self._on_busy(True)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
 
-class _SemCtx:
-    def __init__(self, sem: asyncio.Semaphore): self.sem = sem
-    async def __aenter__(self): await self.sem.acquire()
-    async def __aexit__(self, *exc): self.sem.release()
+    async def __aexit__(self, *exc):
+        self.release()
+
+# ---- global pools (process-scoped, resizable via set_limit) ----
+GLOBAL_SEM   = AdmissionPool(GLOBAL_LIMIT)
+OPENAI_SEM   = AdmissionPool(OPENAI_LIMIT)
+SUPABASE_SEM = AdmissionPool(SUPABASE_LIMIT)
+OTHER_IO_SEM = AdmissionPool(OTHER_IO_LIMIT)
+
+class PerUserPool:
+    """
+    Bounded map of user_id -> AdmissionPool.
+    
+    Idle pools (no slot held) are also kept in least-recently-used order,
+    so making room past `max_entries` just pops the oldest idle ones.
+    Pools in use are never evicted, so the map may briefly exceed the bound
+    rather than split a user's limit across two pools.
+    """
+    def __init__(self, limit: int, max_entries: int):
+        self._limit = limit
+        self._max_entries = max_entries
+        self._pools: Dict[str, AdmissionPool] = {}
+        self._idle: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def get(self, user_id: str) -> AdmissionPool:
+        pool = self._pools.get(user_id)
+        if pool is not None:
+            if user_id in self._idle:
+                self._idle.move_to_end(user_id)
+            return pool
+        while len(self._pools) >= self._max_entries and self._idle:
+            del self._pools[self._idle.popitem(last=False)[0]]
+        pool = AdmissionPool(self._limit, on_busy=lambda busy: self._on_busy(user_id, pool, busy))
+        self._pools[user_id] = pool
+        self._idle[user_id] = None
+        return pool
+
+    def __getitem__(self, user_id: str) -> AdmissionPool:
+        return self.get(user_id)
+
+    def _on_busy(self, user_id: str, pool: AdmissionPool, busy: bool) -> None:
+        if self._pools.get(user_id) is not pool:
+            return  # evicted (and maybe replaced) while a caller still held it
+        if busy:
+            self._idle.pop(user_id, None)
+        else:
+            self._idle[user_id] = None
+
+# Optional per-user map (process-scoped)
+_per_user_audio = PerUserPool(PER_USER_AUDIO_LIMIT, PER_USER_MAX_ENTRIES)
 
 class LimitGroup:
     """
-    Acquire multiple semaphores in a fixed order to avoid deadlocks:
+    Acquire multiple pools in a fixed order to avoid deadlocks:
       GLOBAL -> SERVICE -> (optional) PER-USER
+    Released in reverse order on exit (or on a failed/cancelled acquire).
     Usage:
         async with LimitGroup(GLOBAL_SEM, OPENAI_SEM, _per_user_audio[user_id]):
             ...
     """
-    def __init__(self, *sems: asyncio.Semaphore):
+    def __init__(self, *sems: AdmissionPool):
         self._sems = sems
-        self._stack = AsyncExitStack()
+        self._acquired = 0
+
+    def _release(self) -> None:
+        while self._acquired:
+            self._acquired -= 1
+            self._sems[self._acquired].release()
 
     async def __aenter__(self):
-        await self._stack.__aenter__()
-        for sem in self._sems:
-            await self._stack.enter_async_context(_SemCtx(sem))
+        try:
+            for sem in self._sems:
+                await sem.acquire()
+                self._acquired += 1
+        except BaseException:
+            self._release()
+            raise
         return self
 
     async def __aexit__(self, *exc):
-        return await self._stack.__aexit__(*exc)
+        self._release()
 
 # Convenience factories (keeps call sites tidy)
 def openai_limits(user_id: str | None = None) -> LimitGroup:
     if user_id:
-        return LimitGroup(GLOBAL_SEM, OPENAI_SEM, _per_user_audio[user_id])
+        return LimitGroup(GLOBAL_SEM, OPENAI_SEM, _per_user_audio.get(user_id))
     return LimitGroup(GLOBAL_SEM, OPENAI_SEM)
 
 def supabase_limits() -> LimitGroup:
@@ -1,17 +1,95 @@
 """
 HTTP Utilities
 --------------
-Shared HTTP utilities for all services, including SSL context creation
-and common session configuration.
+Shared HTTP utilities for all services, including SSL context creation,
+common session configuration and HTTP error classification for retries.
 """
 
 from __future__ import annotations
 
 import ssl
-from typing import Optional
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
 
 import aiohttp
 import certifi
+from tenacity import RetryCallState
+
+# Statuses worth retrying with backoff (rate limit / transient server errors)
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Process-wide session shared by every service (one connector, DNS cache and
+# keep-alive pool for OpenAI, Supabase, ...)
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+
+class RetryableHTTPError(RuntimeError):
+    """Transient HTTP failure (429 / 5xx) that should be retried with backoff."""
+
+    def __init__(self, message: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class FatalHTTPError(RuntimeError):
+    """HTTP failure that will not succeed on retry (400, 401, 404, ...)."""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without contacting the upstream while its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Process-wide short-circuit for an upstream that is failing for everyone.
+    
+    After `threshold` transient failures within `window` seconds the circuit
+    opens, and check() raises CircuitOpenError for `cooldown` seconds so
+    concurrent callers stop retrying against a known outage.
+    
+    Parameters
+    ----------
+    name : str
+        Upstream name, used in the error message
+    threshold : int
+        Failures within the window that open the circuit (default: 20)
+    window : float
+        Sliding window in seconds for counting failures (default: 10)
+    cooldown : float
+        Seconds the circuit stays open once tripped (default: 30)
+    """
+
+    def __init__(self, name: str, threshold: int = 20, window: float = 10.0, cooldown: float = 30.0):
+        self.name = name
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._failures: Deque[float] = deque()
+        self._opened_at: Optional[float] = None
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if the circuit is open."""
+        if self._opened_at is None:
+            return
+        if time.monotonic() - self._opened_at < self.cooldown:
+            raise CircuitOpenError(f"{self.name} circuit open, skipping request")
+        self._opened_at = None  # cooldown over: let requests probe the upstream again
+
+    def record_failure(self) -> None:
+        """Record a transient failure, opening the circuit past the threshold."""
+        now = time.monotonic()
+        self._failures.append(now)
+        while self._failures[0] < now - self.window:
+            self._failures.popleft()
+        if len(self._failures) >= self.threshold:
+            self._opened_at = now
+            self._failures.clear()
 
 
 def create_ssl_context() -> ssl.SSLContext:
@@ -32,7 +110,9 @@ def create_ssl_context() -> ssl.SSLContext:
 def create_tcp_connector(
     ssl_context: Optional[ssl.SSLContext] = None,
     limit: int = 100,
-    limit_per_host: int = 30
+    limit_per_host: int = 30,
+    ttl_dns_cache: int = 300,
+    keepalive_timeout: float = 75.0
 ) -> aiohttp.TCPConnector:
     """
     Create a configured TCP connector for aiohttp sessions.
@@ -45,6 +125,11 @@ def create_tcp_connector(
         Total number of simultaneous connections (default: 100)
     limit_per_host : int
         Number of simultaneous connections to one host (default: 30)
+    ttl_dns_cache : int
+        Seconds to cache resolved host addresses (default: 300)
+    keepalive_timeout : float
+        Seconds an idle connection stays in the pool (default: 75, vs
+        aiohttp's 15) so sporadic uploads skip a new TLS handshake
         
     Returns
     -------
@@ -57,6 +142,97 @@ def create_tcp_connector(
     return aiohttp.TCPConnector(
         ssl=ssl_context,
         limit=limit,
-        limit_per_host=limit_per_host
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=ttl_dns_cache,
+        keepalive_timeout=keepalive_timeout
     )
 
+
+def get_shared_session(timeout: int = 30, read_bufsize: int = 1 << 20) -> aiohttp.ClientSession:
+    """
+    Return the process-wide aiohttp session, creating it on first use.
+    
+    Parameters
+    ----------
+    timeout : int
+        Total request timeout in seconds, applied when the session is
+        created (default: 30). Later calls reuse the existing session.
+    read_bufsize : int
+        Response read buffer size in bytes (default: 1 MiB, vs aiohttp's
+        64 KiB) so audio-sized bodies are drained in a few large reads
+        
+    Returns
+    -------
+    aiohttp.ClientSession
+        Shared session using a connector from create_tcp_connector()
+    """
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = aiohttp.ClientSession(
+            connector=create_tcp_connector(),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            read_bufsize=read_bufsize
+        )
+    return _shared_session
+
+
+async def close_shared_session() -> None:
+    """Close the shared session (and its connector) at shutdown."""
+    global _shared_session
+    if _shared_session and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
+
+def http_error(message: str, status: int, retry_after: Optional[str] = None) -> RuntimeError:
+    """
+    Build the exception matching an unsuccessful HTTP status.
+    
+    Parameters
+    ----------
+    message : str
+        Error message (typically service name, status and response body)
+    status : int
+        HTTP status code of the response
+    retry_after : Optional[str]
+        Raw Retry-After header value, if any (delta-seconds form)
+        
+    Returns
+    -------
+    RuntimeError
+        RetryableHTTPError for RETRYABLE_STATUSES, FatalHTTPError otherwise
+    """
+    if status in RETRYABLE_STATUSES:
+        try:
+            delay = float(retry_after) if retry_after else None
+        except ValueError:  # HTTP-date form: fall back to exponential backoff
+            delay = None
+        return RetryableHTTPError(message, status, delay)
+    return FatalHTTPError(message, status)
+
+
+def wait_retry_after(
+    fallback: Callable[[RetryCallState], float],
+    max_wait: float = 60.0
+) -> Callable[[RetryCallState], float]:
+    """
+    Tenacity wait strategy that honours a server-provided Retry-After.
+    
+    Parameters
+    ----------
+    fallback : Callable[[RetryCallState], float]
+        Wait strategy used when the last error carries no Retry-After
+    max_wait : float
+        Upper bound (seconds) on a server-requested delay (default: 60)
+        
+    Returns
+    -------
+    Callable[[RetryCallState], float]
+        Wait strategy to pass as tenacity's `wait=`
+    """
+    def _wait(retry_state: RetryCallState) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(exc, RetryableHTTPError) and exc.retry_after is not None:
+            return min(exc.retry_after, max_wait)
+        return fallback(retry_state)
+    return _wait
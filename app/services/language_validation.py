@@ -1,363 +1,137 @@
 """
 Language validation service for the application.
 Provides validation for supported languages across chat and lesson features.
+
+The language table is stored once, as one name -> value dict per column
+(CODES, GREETINGS, TOPICS) built from _ROWS at import; LANGUAGE_MAP is a
+read-only nested view of the same values, built once from those columns.
+The module-level functions below are the API (LanguageValidator is an alias
+for this module).
 """
 
-from typing import List, Dict, Optional
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 
-# Language map with ISO 639-1 codes for OpenAI Whisper STT and simple A1/A2-friendly greetings
-LANGUAGE_MAP = {
-    "Afrikaans": {
-        "code": "af",
-        "greeting": "Hallo! Hoe gaan dit?",
-        "topic": "Waaroor wil jy vandag gesels?",
-    },
-    "Arabic": {
-        "code": "ar",
-        "greeting": "مرحباً! كيف حالك؟",
-        "topic": "عن ماذا ترغب في التحدث اليوم؟",
-    },
-    "Bulgarian": {
-        "code": "bg",
-        "greeting": "Здравей! Как си?",
-        "topic": "За какво искаш да говорим днес?",
-    },
-    "Catalan": {
-        "code": "ca",
-        "greeting": "Hola! Com estàs?",
-        "topic": "De què t'agradaria parlar avui?",
-    },
-    "Chinese": {
-        "code": "zh",
-        "greeting": "你好！你好吗？",
-        "topic": "你今天想聊什么？",
-    },
-    "Croatian": {
-        "code": "hr",
-        "greeting": "Bok! Kako si?",
-        "topic": "O čemu želiš razgovarati danas?",
-    },
-    "Czech": {
-        "code": "cs",
-        "greeting": "Ahoj! Jak se máš?",
-        "topic": "O čem bys chtěl dnes mluvit?",
-    },
-    "Danish": {
-        "code": "da",
-        "greeting": "Hej! Hvordan har du det?",
-        "topic": "Hvad vil du gerne tale om i dag?",
-    },
-    "Dutch": {
-        "code": "nl",
-        "greeting": "Hallo! Hoe gaat het?",
-        "topic": "Waar wil je het vandaag over hebben?",
-    },
-    "English": {
-        "code": "en",
-        "greeting": "Hello! How are you?",
-        "topic": "What would you like to talk about today?",
-    },
-    "Filipino": {
-        "code": "tl",  # Filipino uses Tagalog code
-        "greeting": "Kumusta! Kamusta ka?",
-        "topic": "Anong gusto mong pag-usapan ngayon?",
-    },
-    "Finnish": {
-        "code": "fi",
-        "greeting": "Hei! Mitä kuuluu?",
-        "topic": "Mistä haluaisit puhua tänään?",
-    },
-    "French": {
-        "code": "fr",
-        "greeting": "Salut ! Comment ça va ?",
-        "topic": "De quoi aimerais-tu parler aujourd'hui ?",
-    },
-    "German": {
-        "code": "de",
-        "greeting": "Hallo! Wie geht's?",
-        "topic": "Worüber möchtest du heute sprechen?",
-    },
-    "Greek": {
-        "code": "el",
-        "greeting": "Γεια σου! Τι κάνεις;",
-        "topic": "Για τι θα ήθελες να μιλήσουμε σήμερα;",
-    },
-    "Hebrew": {
-        "code": "he",
-        "greeting": "שלום! מה שלומך?",
-        "topic": "על מה תרצה לדבר היום?",
-    },
-    "Hindi": {
-        "code": "hi",
-        "greeting": "नमस्ते! आप कैसे हैं?",
-        "topic": "आज आप किस बारे में बात करना चाहेंगे?",
-    },
-    "Hungarian": {
-        "code": "hu",
-        "greeting": "Szia! Hogy vagy?",
-        "topic": "Miről szeretnél ma beszélni?",
-    },
-    "Indonesian": {
-        "code": "id",
-        "greeting": "Halo! Apa kabar?",
-        "topic": "Tentang apa kamu ingin berbicara hari ini?",
-    },
-    "Italian": {
-        "code": "it",
-        "greeting": "Ciao! Come stai?",
-        "topic": "Di cosa ti piacerebbe parlare oggi?",
-    },
-    "Japanese": {
-        "code": "ja",
-        "greeting": "こんにちは！お元気ですか？",
-        "topic": "今日は何について話したいですか？",
-    },
-    "Korean": {
-        "code": "ko",
-        "greeting": "안녕하세요! 잘 지내요?",
-        "topic": "오늘은 어떤 이야기를 하고 싶어요?",
-    },
-    "Malay": {
-        "code": "ms",
-        "greeting": "Hai! Apa khabar?",
-        "topic": "Apa yang ingin anda bincangkan hari ini?",
-    },
-    "Norwegian": {
-        "code": "no",
-        "greeting": "Hei! Hvordan har du det?",
-        "topic": "Hva vil du snakke om i dag?",
-    },
-    "Polish": {
-        "code": "pl",
-        "greeting": "Cześć! Jak się masz?",
-        "topic": "O czym chciałbyś dziś porozmawiać?",
-    },
-    "Portuguese (Portugal)": {
-        "code": "pt",
-        "greeting": "Olá! Como estás?",
-        "topic": "Sobre o que gostarias de falar hoje?",
-    },
-    "Portuguese (Brazil)": {
-        "code": "pt",
-        "greeting": "Oi! Tudo bem?",
-        "topic": "Sobre o que você gostaria de conversar hoje?",
-    },
-    "Romanian": {
-        "code": "ro",
-        "greeting": "Bună! Ce mai faci?",
-        "topic": "Despre ce ai vrea să vorbim astăzi?",
-    },
-    "Russian": {
-        "code": "ru",
-        "greeting": "Привет! Как дела?",
-        "topic": "О чём ты хотел бы поговорить сегодня?",
-    },
-    "Slovak": {
-        "code": "sk",
-        "greeting": "Ahoj! Ako sa máš?",
-        "topic": "O čom by si chcel dnes hovoriť?",
-    },
-    "Spanish (Spain)": {
-        "code": "es",
-        "greeting": "¡Hola! ¿Cómo estás?",
-        "topic": "¿De qué te gustaría hablar hoy?",
-    },
-    "Spanish (Mexico)": {
-        "code": "es",
-        "greeting": "¡Hola! ¿Cómo estás?",
-        "topic": "¿De qué te gustaría hablar hoy?",
-    },
-    "Swedish": {
-        "code": "sv",
-        "greeting": "Hej! Hur mår du?",
-        "topic": "Vad vill du prata om idag?",
-    },
-    "Thai": {
-        "code": "th",
-        "greeting": "สวัสดี! สบายดีไหม?",
-        "topic": "วันนี้คุณอยากคุยเรื่องอะไร?",
-    },
-    "Turkish": {
-        "code": "tr",
-        "greeting": "Merhaba! Nasılsın?",
-        "topic": "Bugün ne hakkında konuşmak istersin?",
-    },
-    "Ukrainian": {
-        "code": "uk",
-        "greeting": "Привіт! Як справи?",
-        "topic": "Про що ти хотів би сьогодні поговорити?",
-    },
-    "Vietnamese": {
-        "code": "vi",
-        "greeting": "Xin chào! Bạn khỏe không?",
-        "topic": "Hôm nay bạn muốn nói về điều gì?",
-    },
-    "Armenian": {
-        "code": "hy",
-        "greeting": "Բարև! Ինչպե՞ս ես:",
-        "topic": "Որի մասին կցանկանայիր խոսել այսօր:",
-    },
-    "Azerbaijani": {
-        "code": "az",
-        "greeting": "Salam! Necəsən?",
-        "topic": "Bu gün nə haqqında danışmaq istərdiniz?",
-    },
-    "Belarusian": {
-        "code": "be",
-        "greeting": "Прывітанне! Як справы?",
-        "topic": "Пра што ты хацеў бы пагаварыць сёння?",
-    },
-    "Bosnian": {
-        "code": "bs",
-        "greeting": "Zdravo! Kako si?",
-        "topic": "O čemu želiš razgovarati danas?",
-    },
-    "Estonian": {
-        "code": "et",
-        "greeting": "Tere! Kuidas läheb?",
-        "topic": "Millest sa tahaksid täna rääkida?",
-    },
-    "Galician": {
-        "code": "gl",
-        "greeting": "Ola! Como estás?",
-        "topic": "De que che gustaría falar hoxe?",
-    },
-    "Icelandic": {
-        "code": "is",
-        "greeting": "Halló! Hvernig hefurðu það?",
-        "topic": "Um hvað viltu tala í dag?",
-    },
-    "Kannada": {
-        "code": "kn",
-        "greeting": "ನಮಸ್ಕಾರ! ನೀವು ಹೇಗಿದ್ದೀರಿ?",
-        "topic": "ಇಂದು ನೀವು ಯಾವ ವಿಷಯದ ಬಗ್ಗೆ ಮಾತನಾಡಲು ಬಯಸುತ್ತೀರಿ?",
-    },
-    "Kazakh": {
-        "code": "kk",
-        "greeting": "Сәлем! Қалың қалай?",
-        "topic": "Бүгін не туралы сөйлескіңіз келеді?",
-    },
-    "Latvian": {
-        "code": "lv",
-        "greeting": "Sveiki! Kā iet?",
-        "topic": "Par ko tu vēlētos runāt šodien?",
-    },
-    "Lithuanian": {
-        "code": "lt",
-        "greeting": "Labas! Kaip sekasi?",
-        "topic": "Apie ką norėtum šiandien pakalbėti?",
-    },
-    "Macedonian": {
-        "code": "mk",
-        "greeting": "Здраво! Како си?",
-        "topic": "За што сакаш да зборуваме денес?",
-    },
-    "Marathi": {
-        "code": "mr",
-        "greeting": "नमस्कार! तू कसा आहेस?",
-        "topic": "आज तुम्हाला कशाबद्दल बोलायचे आहे?",
-    },
-    "Maori": {
-        "code": "mi",
-        "greeting": "Kia ora! Kei te pēhea koe?",
-        "topic": "He aha tāu e hiahia ana ki te kōrero i tēnei rā?",
-    },
-    "Nepali": {
-        "code": "ne",
-        "greeting": "नमस्ते! तपाईं कस्तो हुनुहुन्छ?",
-        "topic": "आज तपाईं के बारेमा कुरा गर्न चाहनुहुन्छ?",
-    },
-    "Persian": {
-        "code": "fa",
-        "greeting": "سلام! حال شما چطور است؟",
-        "topic": "امروز می‌خواهید در مورد چه چیزی صحبت کنید؟",
-    },
-    "Serbian": {
-        "code": "sr",
-        "greeting": "Здраво! Како си?",
-        "topic": "О чему желиш да причамо данас?",
-    },
-    "Slovenian": {
-        "code": "sl",
-        "greeting": "Živjo! Kako si?",
-        "topic": "O čem bi rad govoril danes?",
-    },
-    "Swahili": {
-        "code": "sw",
-        "greeting": "Habari! Habari gani?",
-        "topic": "Ungependa kuzungumza kuhusu nini leo?",
-    },
-    "Tagalog": {
-        "code": "tl",
-        "greeting": "Kumusta! Kumusta ka?",
-        "topic": "Anong gusto mong pag-usapan ngayon?",
-    },
-    "Tamil": {
-        "code": "ta",
-        "greeting": "வணக்கம்! எப்படி இருக்கிறீர்கள்?",
-        "topic": "இன்று நீங்கள் எதைப் பற்றி பேச விரும்புகிறீர்கள்?",
-    },
-    "Urdu": {
-        "code": "ur",
-        "greeting": "السلام علیکم! آپ کیسے ہیں؟",
-        "topic": "آج آپ کس بارے میں بات کرنا چاہیں گے؟",
-    },
-    "Welsh": {
-        "code": "cy",
-        "greeting": "Helo! Sut wyt ti?",
-        "topic": "Am beth hoffet ti siarad heddiw?",
-    },
-}
 
+# Supported languages as (name, ISO 639-1 code for OpenAI Whisper STT,
+# A1/A2-friendly greeting, topic question) rows
+_ROWS: Tuple[Tuple[str, str, str, str], ...] = (
+    ("Afrikaans", "af", "Hallo! Hoe gaan dit?", "Waaroor wil jy vandag gesels?"),
+    ("Arabic", "ar", "مرحباً! كيف حالك؟", "عن ماذا ترغب في التحدث اليوم؟"),
+    ("Bulgarian", "bg", "Здравей! Как си?", "За какво искаш да говорим днес?"),
+    ("Catalan", "ca", "Hola! Com estàs?", "De què t'agradaria parlar avui?"),
+    ("Chinese", "zh", "你好！你好吗？", "你今天想聊什么？"),
+    ("Croatian", "hr", "Bok! Kako si?", "O čemu želiš razgovarati danas?"),
+    ("Czech", "cs", "Ahoj! Jak se máš?", "O čem bys chtěl dnes mluvit?"),
+    ("Danish", "da", "Hej! Hvordan har du det?", "Hvad vil du gerne tale om i dag?"),
+    ("Dutch", "nl", "Hallo! Hoe gaat het?", "Waar wil je het vandaag over hebben?"),
+    ("English", "en", "Hello! How are you?", "What would you like to talk about today?"),
+    ("Filipino", "tl", "Kumusta! Kamusta ka?", "Anong gusto mong pag-usapan ngayon?"),  # Filipino uses Tagalog code
+    ("Finnish", "fi", "Hei! Mitä kuuluu?", "Mistä haluaisit puhua tänään?"),
+    ("French", "fr", "Salut ! Comment ça va ?", "De quoi aimerais-tu parler aujourd'hui ?"),
+    ("German", "de", "Hallo! Wie geht's?", "Worüber möchtest du heute sprechen?"),
+    ("Greek", "el", "Γεια σου! Τι κάνεις;", "Για τι θα ήθελες να μιλήσουμε σήμερα;"),
+    ("Hebrew", "he", "שלום! מה שלומך?", "על מה תרצה לדבר היום?"),
+    ("Hindi", "hi", "नमस्ते! आप कैसे हैं?", "आज आप किस बारे में बात करना चाहेंगे?"),
+    ("Hungarian", "hu", "Szia! Hogy vagy?", "Miről szeretnél ma beszélni?"),
+    ("Indonesian", "id", "Halo! Apa kabar?", "Tentang apa kamu ingin berbicara hari ini?"),
+    ("Italian", "it", "Ciao! Come stai?", "Di cosa ti piacerebbe parlare oggi?"),
+    ("Japanese", "ja", "こんにちは！お元気ですか？", "今日は何について話したいですか？"),
+    ("Korean", "ko", "안녕하세요! 잘 지내요?", "오늘은 어떤 이야기를 하고 싶어요?"),
+    ("Malay", "ms", "Hai! Apa khabar?", "Apa yang ingin anda bincangkan hari ini?"),
+    ("Norwegian", "no", "Hei! Hvordan har du det?", "Hva vil du snakke om i dag?"),
+    ("Polish", "pl", "Cześć! Jak się masz?", "O czym chciałbyś dziś porozmawiać?"),
+    ("Portuguese (Portugal)", "pt", "Olá! Como estás?", "Sobre o que gostarias de falar hoje?"),
+    ("Portuguese (Brazil)", "pt", "Oi! Tudo bem?", "Sobre o que você gostaria de conversar hoje?"),
+    ("Romanian", "ro", "Bună! Ce mai faci?", "Despre ce ai vrea să vorbim astăzi?"),
+    ("Russian", "ru", "Привет! Как дела?", "О чём ты хотел бы поговорить сегодня?"),
+    ("Slovak", "sk", "Ahoj! Ako sa máš?", "O čom by si chcel dnes hovoriť?"),
+    ("Spanish (Spain)", "es", "¡Hola! ¿Cómo estás?", "¿De qué te gustaría hablar hoy?"),
+    ("Spanish (Mexico)", "es", "¡Hola! ¿Cómo estás?", "¿De qué te gustaría hablar hoy?"),
+    ("Swedish", "sv", "Hej! Hur mår du?", "Vad vill du prata om idag?"),
+    ("Thai", "th", "สวัสดี! สบายดีไหม?", "วันนี้คุณอยากคุยเรื่องอะไร?"),
+    ("Turkish", "tr", "Merhaba! Nasılsın?", "Bugün ne hakkında konuşmak istersin?"),
+    ("Ukrainian", "uk", "Привіт! Як справи?", "Про що ти хотів би сьогодні поговорити?"),
+    ("Vietnamese", "vi", "Xin chào! Bạn khỏe không?", "Hôm nay bạn muốn nói về điều gì?"),
+    ("Armenian", "hy", "Բարև! Ինչպե՞ս ես:", "Որի մասին կցանկանայիր խոսել այսօր:"),
+    ("Azerbaijani", "az", "Salam! Necəsən?", "Bu gün nə haqqında danışmaq istərdiniz?"),
+    ("Belarusian", "be", "Прывітанне! Як справы?", "Пра што ты хацеў бы пагаварыць сёння?"),
+    ("Bosnian", "bs", "Zdravo! Kako si?", "O čemu želiš razgovarati danas?"),
+    ("Estonian", "et", "Tere! Kuidas läheb?", "Millest sa tahaksid täna rääkida?"),
+    ("Galician", "gl", "Ola! Como estás?", "De que che gustaría falar hoxe?"),
+    ("Icelandic", "is", "Halló! Hvernig hefurðu það?", "Um hvað viltu tala í dag?"),
+    ("Kannada", "kn", "ನಮಸ್ಕಾರ! ನೀವು ಹೇಗಿದ್ದೀರಿ?", "ಇಂದು ನೀವು ಯಾವ ವಿಷಯದ ಬಗ್ಗೆ ಮಾತನಾಡಲು ಬಯಸುತ್ತೀರಿ?"),
+    ("Kazakh", "kk", "Сәлем! Қалың қалай?", "Бүгін не туралы сөйлескіңіз келеді?"),
+    ("Latvian", "lv", "Sveiki! Kā iet?", "Par ko tu vēlētos runāt šodien?"),
+    ("Lithuanian", "lt", "Labas! Kaip sekasi?", "Apie ką norėtum šiandien pakalbėti?"),
+    ("Macedonian", "mk", "Здраво! Како си?", "За што сакаш да зборуваме денес?"),
+    ("Marathi", "mr", "नमस्कार! तू कसा आहेस?", "आज तुम्हाला कशाबद्दल बोलायचे आहे?"),
+    ("Maori", "mi", "Kia ora! Kei te pēhea koe?", "He aha tāu e hiahia ana ki te kōrero i tēnei rā?"),
+    ("Nepali", "ne", "नमस्ते! तपाईं कस्तो हुनुहुन्छ?", "आज तपाईं के बारेमा कुरा गर्न चाहनुहुन्छ?"),
+    ("Persian", "fa", "سلام! حال شما چطور است؟", "امروز می‌خواهید در مورد چه چیزی صحبت کنید؟"),
+    ("Serbian", "sr", "Здраво! Како си?", "О чему желиш да причамо данас?"),
+    ("Slovenian", "sl", "Živjo! Kako si?", "O čem bi rad govoril danes?"),
+    ("Swahili", "sw", "Habari! Habari gani?", "Ungependa kuzungumza kuhusu nini leo?"),
+    ("Tagalog", "tl", "Kumusta! Kumusta ka?", "Anong gusto mong pag-usapan ngayon?"),
+    ("Tamil", "ta", "வணக்கம்! எப்படி இருக்கிறீர்கள்?", "இன்று நீங்கள் எதைப் பற்றி பேச விரும்புகிறீர்கள்?"),
+    ("Urdu", "ur", "السلام علیکم! آپ کیسے ہیں؟", "آج آپ کس بارے میں بات کرنا چاہیں گے؟"),
+    ("Welsh", "cy", "Helo! Sut wyt ti?", "Am beth hoffet ti siarad heddiw?"),
+)
 
-class LanguageValidator:
-    """Service class for language validation and management."""
-    
-    @staticmethod
-    def get_supported_languages() -> List[str]:
-        return list(LANGUAGE_MAP.keys())
-    
-    @staticmethod
-    def is_language_supported(language: str) -> bool:
-        return language in LANGUAGE_MAP
-    
-    @staticmethod
-    def validate_language(language: str) -> str:
-        if not language:
-            raise ValueError("Language cannot be empty")
-        if not LanguageValidator.is_language_supported(language):
-            supported = ", ".join(LanguageValidator.get_supported_languages())
-            raise ValueError(f"Language '{language}' is not supported. Supported: {supported}")
-        return language
-    
-    @staticmethod
-    def get_language_code(language: str) -> Optional[str]:
-        validated = LanguageValidator.validate_language(language)
-        return LANGUAGE_MAP.get(validated, {}).get("code")
+# Columns (name -> field) built once at import, so accessors are a single probe.
+# Keys are interned so lookups with literal language names compare by identity.
+_CODES: Dict[str, str] = {sys.intern(name): code for name, code, _, _ in _ROWS}
+_GREETINGS: Dict[str, str] = {sys.intern(name): greeting for name, _, greeting, _ in _ROWS}
+_TOPICS: Dict[str, str] = {sys.intern(name): topic for name, _, _, topic in _ROWS}
+CODES: Mapping[str, str] = MappingProxyType(_CODES)
+GREETINGS: Mapping[str, str] = MappingProxyType(_GREETINGS)
+TOPICS: Mapping[str, str] = MappingProxyType(_TOPICS)
+
+_SUPPORTED_LIST: Tuple[str, ...] = tuple(_CODES)
+_SUPPORTED_JOINED = ", ".join(_SUPPORTED_LIST)
+
+
+# Language map in the original {name: {"code", "greeting", "topic"}} shape
+# (read-only at both levels: the table is static for the life of the process)
+LANGUAGE_MAP: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    name: MappingProxyType({"code": code, "greeting": _GREETINGS[name], "topic": _TOPICS[name]})
+    for name, code in _CODES.items()
+})
 
-    @staticmethod
-    def get_language_greeting(language: str) -> Optional[str]:
-        validated = LanguageValidator.validate_language(language)
-        return LANGUAGE_MAP.get(validated, {}).get("greeting")
 
-    @staticmethod
-    def get_language_topic(language: str) -> Optional[str]:
-        validated = LanguageValidator.validate_language(language)
-        return LANGUAGE_MAP.get(validated, {}).get("topic")
+def _lookup(column: Dict[str, str], language: str) -> str:
+    value = column.get(language)
+    if value is None:
+        validate_language(language)  # raises the appropriate ValueError
+    return value
 
 
-# Convenience functions
+# Public API
 def validate_language(language: str) -> str:
-    return LanguageValidator.validate_language(language)
+    if language not in _CODES:  # "" is never supported, so one test on the happy path
+        if not language:
+            raise ValueError("Language cannot be empty")
+        raise ValueError(f"Language '{language}' is not supported. Supported: {_SUPPORTED_JOINED}")
+    return language
 
 def is_language_supported(language: str) -> bool:
-    return LanguageValidator.is_language_supported(language)
+    return language in _CODES
+
+def get_supported_languages() -> Tuple[str, ...]:
+    return _SUPPORTED_LIST  # shared and immutable; list() it at a boundary that needs a list
+
+def get_language_code(language: str) -> str:
+    return _lookup(_CODES, language)
+
+def get_language_greeting(language: str) -> str:
+    return _lookup(_GREETINGS, language)
 
-def get_supported_languages() -> List[str]:
-    return LanguageValidator.get_supported_languages()
+def get_language_topic(language: str) -> str:
+    return _lookup(_TOPICS, language)
 
-def get_language_greeting(language: str) -> Optional[str]:
-    return LanguageValidator.get_language_greeting(language)
 
-def get_language_topic(language: str) -> Optional[str]:
-    return LanguageValidator.get_language_topic(language)
+# Backwards-compatible namespace: app.services still re-exports
+# LanguageValidator, and LanguageValidator.<fn>(...) resolves to the module
+# functions above
+LanguageValidator = sys.modules[__name__]
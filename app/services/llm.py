@@ -1,5 +1,6 @@
 import os
 import dotenv
+from functools import cache, lru_cache
 from typing import Optional
 from langchain_openai import ChatOpenAI
 
@@ -7,33 +8,60 @@ dotenv.load_dotenv()
 
 _OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Defaults (override via env)
-_DEFAULT_MODEL      = os.getenv("STRONG_MODEL")
-_RESPONSE_MODEL     = os.getenv("STRONG_MODEL")      
-_SUMMARY_MODEL      = os.getenv("FAST_MODEL")       
-_VALIDATION_MODEL   = os.getenv("FAST_MODEL")    
-_RESPONSE_CORRECTION_MODEL = os.getenv("FAST_MODEL")    
+# Defaults (override via env). Each task has its own variable so the
+# user-facing reply can stay on the flagship model while correction and
+# summarization run on a small, fast one; STRONG_MODEL / FAST_MODEL are fallbacks.
+# Variables are tried in order; the first non-empty one wins.
+_MODEL_ENV_VARS = {
+    "default":    ("STRONG_MODEL",),
+    "response":   ("MAIN_MODEL", "STRONG_MODEL"),
+    "summary":    ("SUMMARY_MODEL", "FAST_MODEL"),
+    "validation": ("FAST_MODEL",),
+    "correction": ("CORRECTION_MODEL", "FAST_MODEL"),
+}
 
-def get_llm(model: Optional[str] = None, **kwargs) -> ChatOpenAI:
+@cache
+def _resolved_model(kind: str) -> Optional[str]:
     """
-    Factory for ChatOpenAI with sensible defaults. 
-    Pass model=... to override per call, or rely on env-configured task getters below.
-    Extra OpenAI params (temperature, timeout, etc.) can be passed via **kwargs.
+    Model name for a task, read from env once and memoized.
+    Tests that change the env can reset it with _resolved_model.cache_clear().
     """
+    return next((name for name in map(os.getenv, _MODEL_ENV_VARS[kind]) if name), None)
+
+def _build_llm(model: Optional[str], **kwargs) -> ChatOpenAI:
     return ChatOpenAI(
-        model=model or _DEFAULT_MODEL,
+        model=model or _resolved_model("default"),
         api_key=_OPENAI_API_KEY,
         **kwargs
     )
 
+@lru_cache(maxsize=16)
+def _get_llm_cached(model: Optional[str], frozen_kwargs: frozenset) -> ChatOpenAI:
+    return _build_llm(model, **dict(frozen_kwargs))
+
+def get_llm(model: Optional[str] = None, **kwargs) -> ChatOpenAI:
+    """
+    Factory for ChatOpenAI with sensible defaults. 
+    Pass model=... to override per call, or rely on env-configured task getters below.
+    Extra OpenAI params (temperature, timeout, etc.) can be passed via **kwargs.
+    
+    Clients are shared per (model, kwargs), so repeated calls reuse one client
+    and its connection pool; unhashable kwargs get a fresh client each call.
+    """
+    try:
+        key = frozenset(kwargs.items())  # hashes every value; raises on unhashable ones
+    except TypeError:
+        return _build_llm(model, **kwargs)
+    return _get_llm_cached(model, key)
+
 def llm_response(**kwargs) -> ChatOpenAI:
     """Model for main conversational responses."""
-    return get_llm(_RESPONSE_MODEL, **kwargs)
+    return get_llm(_resolved_model("response"), **kwargs)
 
 def llm_summary(**kwargs) -> ChatOpenAI:
     """Model for summarization."""
-    return get_llm(_SUMMARY_MODEL, **kwargs)
+    return get_llm(_resolved_model("summary"), **kwargs)
 
 def llm_response_correction(**kwargs) -> ChatOpenAI:
     """Model for response correction."""
-    return get_llm(_RESPONSE_CORRECTION_MODEL, **kwargs)
\ No newline at end of file
+    return get_llm(_resolved_model("correction"), **kwargs)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+
+from app.services.concurrency import AdmissionPool, LimitGroup, PerUserPool
+
+
+class AdmissionPoolTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cancelled_holder_releases_to_queued_waiter(self):
+        pool = AdmissionPool(1)
+        held = asyncio.Event()
+
+        async def holder():
+            async with LimitGroup(pool):
+                held.set()
+                await asyncio.sleep(3600)
+
+        holder_task = asyncio.create_task(holder())
+        await held.wait()
+        waiter_task = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        self.assertFalse(waiter_task.done())
+
+        # Cancelling the holder runs its release while the waiter is queued
+        holder_task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await holder_task
+
+        await asyncio.wait_for(waiter_task, timeout=1)
+        self.assertEqual(pool.active, 1)
+        pool.release()
+        self.assertEqual(pool.active, 0)
+
+    async def test_cancelled_waiter_does_not_take_a_slot(self):
+        pool = AdmissionPool(1)
+        await pool.acquire()
+        cancelled = asyncio.create_task(pool.acquire())
+        queued = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await cancelled
+        pool.release()
+
+        await asyncio.wait_for(queued, timeout=1)
+        self.assertEqual(pool.active, 1)
+
+    async def test_set_limit_admits_waiters(self):
+        pool = AdmissionPool(1)
+        await pool.acquire()
+        waiters = [asyncio.create_task(pool.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        pool.set_limit(3)
+        await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+        self.assertEqual(pool.active, 3)
+
+
+class PerUserPoolTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_evicts_least_recently_used_idle_pool(self):
+        pools = PerUserPool(1, max_entries=3)
+        busy = pools.get("a")
+        await busy.acquire()
+        recent = pools.get("b")
+        pools.get("c")
+        pools.get("b")
+
+        pools.get("d")  # evicts "c", the oldest idle pool
+        self.assertEqual(len(pools), 3)
+        self.assertIs(pools.get("a"), busy)
+        self.assertIs(pools.get("b"), recent)
+
+    async def test_busy_pools_are_not_evicted(self):
+        pools = PerUserPool(1, max_entries=1)
+        busy = pools.get("a")
+        await busy.acquire()
+
+        pools.get("b")
+        self.assertEqual(len(pools), 2)
+        self.assertIs(pools.get("a"), busy)
+
+    async def test_evicted_pool_does_not_pin_its_replacement(self):
+        pools = PerUserPool(1, max_entries=1)
+        stale = pools.get("a")
+        pools.get("b")  # evicts "a"
+        replacement = pools.get("a")  # evicts "b"
+        self.assertIsNot(replacement, stale)
+
+        # A caller that fetched "a" before eviction acquires the old pool
+        await stale.acquire()
+        stale.release()
+
+        pools.get("c")
+        self.assertEqual(len(pools), 1)
+        self.assertIsNot(pools.get("a"), replacement)
+
+
+if __name__ == "__main__":
+    unittest.main()